@@ -16,6 +16,15 @@ import logging
 from dotenv import load_dotenv
 from process import process
 
+# Environment variables that must be set before the monitor starts
+REQUIRED_ENV_VARS = (
+    'BSKY_BOT_USERNAME',
+    'BSKY_BOT_PASSWORD',
+    'GPT_API_KEY',
+    'AZURE_OPENAI_ENDPOINT',
+    'GPT_DEPLOYMENT_NAME'
+)
+
 # Setup logging
 def setup_logging():
     """Configure logging with timestamp and level"""
@@ -37,17 +46,8 @@ def main():
     # Load environment variables
     load_dotenv()
     
-    # Required environment variables
-    required_vars = [
-        'BSKY_BOT_USERNAME',
-        'BSKY_BOT_PASSWORD',
-        'GPT_API_KEY',
-        'AZURE_OPENAI_ENDPOINT',
-        'GPT_DEPLOYMENT_NAME'
-    ]
-    
-    # Check for required environment variables
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    # Check for required environment variables once, before entering the loop
+    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
     if missing_vars:
         logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
         logger.error("Please set them in .env file")
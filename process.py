@@ -18,10 +18,11 @@ import json
 import logging
 from pathlib import Path
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 # Import all component modules
-from src.get_mentions import get_mentions
+from src.get_mentions import get_mentions, requeue_mention
 from src.filter_mentions import filter_unprocessed_mentions
 from src.check_media import check_media
 from src.download_video import download_video
@@ -72,6 +73,8 @@ class BotProcessor:
         self.logger = setup_logging(debug)
         self.debug = debug
         self.ai_caller = AIApiCaller()
+        # Number of mention threads fetched concurrently per cycle
+        self.thread_fetch_workers = 8
         
         # Ensure all required directories exist
         self.setup_directories()
@@ -97,6 +100,8 @@ class BotProcessor:
         Main processing function that orchestrates the entire workflow
         Returns True if processing completed successfully
         """
+        # Mentions not yet handled this cycle, handed back to get_mentions if the cycle fails
+        unfinished = {}
         try:
             # Step 1: Get mentions
             self.logger.info("Getting mentions...")
@@ -104,6 +109,7 @@ class BotProcessor:
             if not mentions:
                 self.logger.info("No mentions found")
                 return True
+            unfinished = dict.fromkeys(mentions)
             
           #  # Step 2: Filter unprocessed mentions
           #  self.logger.info("Filtering unprocessed mentions...")
@@ -112,12 +118,23 @@ class BotProcessor:
           #      self.logger.info("No unprocessed mentions found")
           #      return True
             
+            # Thread lookups only wait on the network, so fetch them all up front, concurrently
+            self.logger.info(f"Getting threads for {len(mentions)} mentions...")
+            with ThreadPoolExecutor(max_workers=self.thread_fetch_workers) as executor:
+                thread_results = list(executor.map(lambda uri: get_thread(uri, debug=self.debug), mentions))
+            
             # Process each unprocessed mention
-            for mention_uri in mentions:
+            for mention_uri, thread_result in zip(mentions, thread_results):
                 self.logger.info(f"\nProcessing mention: {mention_uri}")
-                success = self.process_single_mention(mention_uri)
+                success = self.process_single_mention(mention_uri, thread_result)
+                del unfinished[mention_uri]
                 if not success:
                     self.logger.error(f"Failed to process mention: {mention_uri}")
+                    # get_mentions only returns new notifications, so ask for this one again next cycle.
+                    # Only failures after the thread was fetched are retried, as get_thread is not going
+                    # to return a thread next cycle for a post it could not find now.
+                    if thread_result and thread_result.get('success'):
+                        requeue_mention(mention_uri)
                     continue
                 
                 # Add delay between processing mentions
@@ -127,15 +144,17 @@ class BotProcessor:
             
         except Exception as e:
             self.logger.error(f"Error in process_mentions: {str(e)}")
+            for mention_uri in unfinished:
+                requeue_mention(mention_uri)
             return False
     
-    def process_single_mention(self, mention_uri: str) -> bool:
-        """Process a single mention through the entire workflow"""
+    def process_single_mention(self, mention_uri: str, thread_result: Optional[Dict[str, Any]] = None) -> bool:
+        """Process a single mention through the entire workflow, reusing an already fetched thread if given"""
         try:
             # Step 2: Get full thread info
-            self.logger.info("Getting post thread...")
-           
-            thread_result = get_thread(mention_uri, debug=self.debug)
+            if thread_result is None:
+                self.logger.info("Getting post thread...")
+                thread_result = get_thread(mention_uri, debug=self.debug)
             
             if not thread_result['success']:
                 self.logger.error("Failed to get thread info")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Bluesky login shared by the scripts that need an authenticated client.
+Logins resume the session saved by an earlier run when possible, and fall back
+to the password login with retries.
+
+Input: atproto Client + BSKY_BOT_USERNAME and BSKY_BOT_PASSWORD from .env
+Output: DID of the logged in account, or None
+"""
+
+import os
+import sys
+import logging
+import time
+import random
+from functools import lru_cache
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+from atproto import Client
+
+# Load environment variables from .env file once, when the module is imported
+load_dotenv()
+
+# Login sessions exported by the client and reused across runs, so restarts skip the password login.
+# Each caller passes its own session name, since every client refreshes (and so invalidates) its own tokens.
+SESSION_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "sessions")
+SESSION_MAX_AGE = 24 * 60 * 60  # seconds
+
+# XRPC errors meaning the session itself is dead, which only a fresh login fixes
+AUTH_ERRORS = {'ExpiredToken', 'InvalidToken', 'AuthenticationRequired', 'AuthMissing'}
+
+def setup_logging(debug=False):
+    """Set up basic logging configuration"""
+    level = logging.DEBUG if debug else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+    return logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def bot_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """Bot username and password from the environment, read once per process"""
+    return os.environ.get("BSKY_BOT_USERNAME"), os.environ.get("BSKY_BOT_PASSWORD")
+
+def backoff_delay(retry_delay: float, attempt: int) -> float:
+    """Exponential backoff from retry_delay, capped at 32 seconds, with jitter so retries do not align"""
+    delay = min(retry_delay * 2 ** attempt, 32)
+    return delay * (0.5 + random.random() * 0.5)
+
+def is_auth_error(e: Exception) -> bool:
+    """True if an atproto request failed because the session was expired, revoked or missing"""
+    response = getattr(e, 'response', None)
+    if getattr(response, 'status_code', None) == 401:
+        return True
+    return getattr(getattr(response, 'content', None), 'error', None) in AUTH_ERRORS
+
+def _session_file(username: str, session_name: str) -> str:
+    """Path of the saved session of one account for one caller"""
+    return os.path.join(SESSION_DIR, f"{username}.{session_name}.session")
+
+def _save_session(client: Client, session_file: str, logger: logging.Logger) -> None:
+    """Write the client's current session string, readable by the owner only"""
+    try:
+        os.makedirs(SESSION_DIR, exist_ok=True)
+        fd = os.open(session_file + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(client.export_session_string())
+        os.replace(session_file + ".tmp", session_file)
+    except Exception as e:
+        logger.warning(f"Could not save session to {session_file}: {str(e)}")
+
+def _resume_session(client: Client, session_file: str, logger: logging.Logger) -> Optional[str]:
+    """Log in with a saved session younger than SESSION_MAX_AGE, returning the DID or None"""
+    try:
+        if time.time() - os.path.getmtime(session_file) > SESSION_MAX_AGE:
+            return None
+        with open(session_file, 'r') as f:
+            return client.login(session_string=f.read().strip()).did
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A rejected session will not work next time either
+        logger.warning(f"Saved session {session_file} could not be reused: {str(e)}")
+        try:
+            os.remove(session_file)
+        except OSError:
+            pass
+        return None
+
+def authenticate(client: Client, username: str, password: str, session_name: str,
+                 max_retries: int = 3, retry_delay: float = 5,
+                 logger: Optional[logging.Logger] = None) -> Optional[str]:
+    """
+    Log a client in, preferring the session saved by an earlier run
+
+    The client keeps the saved session current whenever it creates or refreshes one.
+
+    Args:
+        client: atproto Client to log in
+        username: Bluesky handle
+        password: Bluesky (app) password
+        session_name: Name of the caller, each caller keeps its own saved session
+        max_retries: Password login attempts
+        retry_delay: Base delay in seconds between attempts
+        logger: Logger for progress messages, defaults to this module's
+
+    Returns:
+        DID of the account, or None if every attempt failed
+    """
+    logger = logger or logging.getLogger(__name__)
+    session_file = _session_file(username, session_name)
+    client.on_session_change(lambda event, session: _save_session(client, session_file, logger))
+
+    did = _resume_session(client, session_file, logger)
+    if did:
+        logger.info(f"Resumed saved session for {username} (DID: {did})")
+        return did
+
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"Attempting to authenticate as {username}")
+            did = client.login(username, password).did
+            logger.info(f"Authentication successful for {username} (DID: {did})")
+            return did
+        except Exception as e:
+            logger.error(f"Authentication attempt {attempt+1}/{max_retries} failed: {str(e)}")
+            if attempt < max_retries - 1:
+                delay = backoff_delay(retry_delay, attempt)
+                logger.info(f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+
+    logger.error(f"Authentication failed after {max_retries} attempts")
+    return None
+
+def main():
+    """Main function with hardcoded example"""
+    logger = setup_logging(debug=True)
+    username, password = bot_credentials()
+    if not username or not password:
+        print("\nMissing BSKY_BOT_USERNAME or BSKY_BOT_PASSWORD in environment")
+        return 1
+
+    did = authenticate(Client(), username, password, "debug", logger=logger)
+    if did:
+        print(f"\nLogged in as {username}")
+        print(did)  # Clean output for piping
+        return 0
+    print("\nLogin failed")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
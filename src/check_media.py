@@ -12,8 +12,14 @@ import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from dotenv import load_dotenv
 
+# Public API requests go through one pooled keep-alive session
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.5)))
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -235,7 +241,7 @@ class BlueskyMediaChecker:
                 "parentHeight": 0
             }
             
-            response = requests.get(endpoint, params=params)
+            response = _session.get(endpoint, params=params)
             response.raise_for_status()
             
             # Parse the response
@@ -265,7 +271,7 @@ class BlueskyMediaChecker:
                 "limit": min(limit, 100)  # API has a maximum limit of 100
             }
             
-            response = requests.get(endpoint, params=params)
+            response = _session.get(endpoint, params=params)
             response.raise_for_status()
             
             # Parse the response
@@ -326,6 +332,9 @@ class BlueskyMediaChecker:
 
 def format_time(timestamp):
     """Format a timestamp into a readable date/time"""
+    # AT Protocol timestamps are UTC ISO-8601 strings, which only need slicing
+    if len(timestamp) >= 20 and timestamp[10] == 'T' and timestamp.endswith('Z'):
+        return f"{timestamp[:10]} {timestamp[11:19]} UTC"
     dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
     return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
 
@@ -11,8 +11,14 @@ import logging
 import time
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from typing import Optional
 
+# Downloads share one pooled session instead of opening a new connection per video
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.5)))
+
 def setup_logging(debug=False):
     """Set up basic logging configuration"""
     level = logging.DEBUG if debug else logging.INFO
@@ -131,7 +137,7 @@ class VideoDownloader:
             self.logger.info(f"Downloading video from URL: {url}")
             self.logger.info(f"Saving to: {output_path}")
             
-            response = requests.get(url, stream=True)
+            response = _session.get(url, stream=True)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
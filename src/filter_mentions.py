@@ -9,8 +9,9 @@ import sys
 import json
 import logging
 import re
+import orjson
 from datetime import datetime
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Iterator
 from pathlib import Path
 
 # Setup logging
@@ -23,10 +24,18 @@ logger = logging.getLogger(__name__)
 
 # Define paths
 DATA_DIR = Path(os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"))
-PROCESSED_FILE = DATA_DIR / "processed_mentions.json"
+PROCESSED_FILE = DATA_DIR / "processed_mentions.jsonl"  # Append-only log, one JSON string per line
+LEGACY_PROCESSED_FILE = DATA_DIR / "processed_mentions.json"
 POSTS_DIR = DATA_DIR / "posts"
 MEMBERS_FILE = DATA_DIR / "members.json"
 
+# Use the linear-time RE2 engine for URI scanning when google-re2 is installed
+try:
+    import re2 as uri_re
+except ImportError:
+    uri_re = re
+URI_PATTERN = uri_re.compile(r'at://[^\s"]+')
+
 def setup_data_dir() -> bool:
     """Ensure the data directory exists"""
     try:
@@ -130,18 +139,84 @@ def get_root_post(thread: Dict[str, Any]) -> Dict[str, Any]:
         return thread['parent_posts'][0]  # First parent is the root
     return thread['main_post']  # If no parents, main post is root
 
+# In-process copy of the processed mentions log, valid while the file's mtime and size are unchanged
+_processed_cache: Dict[str, Any] = {'stamp': None, 'uris': set()}
+
+def _file_stamp() -> tuple:
+    """Identify the current version of the processed mentions log"""
+    stat = PROCESSED_FILE.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _cache_processed(processed: Set[str]) -> Set[str]:
+    """Remember the set as matching the log as it is on disk now"""
+    _processed_cache['stamp'] = _file_stamp()
+    _processed_cache['uris'] = processed
+    return processed
+
+def compact_processed_mentions(processed: Set[str]) -> None:
+    """Rewrite the processed mentions log with one line per URI"""
+    # Write a new log and rename it over the old one, so a crash never leaves a truncated log
+    tmp_file = PROCESSED_FILE.with_suffix('.jsonl.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.writelines(orjson.dumps(uri) + b'\n' for uri in sorted(processed))
+    os.replace(tmp_file, PROCESSED_FILE)
+
+def load_processed_mentions() -> Set[str]:
+    """
+    Load the set of already processed mention URIs.
+    The set is cached in-process and only re-read when the file changes,
+    so callers must not modify the returned set.
+    """
+    if not PROCESSED_FILE.exists():
+        # Migrate the old JSON list format to the append-only log
+        if LEGACY_PROCESSED_FILE.exists():
+            with open(LEGACY_PROCESSED_FILE, 'rb') as f:
+                processed = set(orjson.loads(f.read()))
+            compact_processed_mentions(processed)
+            logger.info(f"Migrated {len(processed)} processed mentions to {PROCESSED_FILE}")
+            return _cache_processed(processed)
+        return set()
+    
+    if _processed_cache['stamp'] == _file_stamp():
+        return _processed_cache['uris']
+    
+    with open(PROCESSED_FILE, 'rb') as f:
+        lines = [line for line in f if line.strip()]
+    # An append cut short by a crash leaves a last line without its newline, and possibly without its closing quote
+    torn = bool(lines) and not lines[-1].endswith(b'\n')
+    try:
+        processed = {orjson.loads(line) for line in lines}
+    except orjson.JSONDecodeError:
+        # Keep every line that still parses instead of losing the whole log
+        processed = set()
+        for line in lines:
+            try:
+                processed.add(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line in {PROCESSED_FILE}: {line[:80]!r}")
+        torn = True
+    
+    # Rewrite the log without the damaged line, so the next append starts on a line of its own,
+    # and compact it once duplicate entries make up more than half of it
+    if torn or len(lines) > 2 * len(processed):
+        compact_processed_mentions(processed)
+        logger.debug(f"Compacted processed mentions log from {len(lines)} to {len(processed)} lines")
+    return _cache_processed(processed)
+
 def mark_post_processed(uri: str) -> bool:
     """Mark a post as processed in the tracking file"""
     try:
-        processed = set()
-        if PROCESSED_FILE.exists():
-            with open(PROCESSED_FILE, 'r') as f:
-                processed = set(json.load(f))
+        processed = load_processed_mentions()
+        if uri in processed:
+            return True
         
-        processed.add(uri)
+        # Append only the new URI instead of rewriting the whole file
+        with open(PROCESSED_FILE, 'ab') as f:
+            f.write(orjson.dumps(uri) + b'\n')
         
-        with open(PROCESSED_FILE, 'w') as f:
-            json.dump(list(processed), f, indent=2)
+        # Update the cached set in place rather than re-reading the file
+        processed.add(uri)
+        _cache_processed(processed)
         return True
     except Exception as e:
         logger.error(f"Error marking post as processed: {str(e)}")
@@ -158,19 +233,15 @@ def filter_unprocessed_mentions(mention_uris: List[str]) -> List[str]:
     """
     # Load required data
     members = load_members()
-    processed = set()
-    if PROCESSED_FILE.exists():
-        with open(PROCESSED_FILE, 'r') as f:
-            processed = set(json.load(f))
+    processed = load_processed_mentions()
+    
+    # Drop duplicates (keeping order) and already processed mentions before any file lookups
+    candidates = [uri for uri in dict.fromkeys(mention_uris) if uri not in processed]
+    logger.debug(f"Skipping {len(mention_uris) - len(candidates)} duplicate or processed mentions")
     
     unprocessed = []
-    for uri in mention_uris:
+    for uri in candidates:
         try:
-            # Skip if already processed
-            if uri in processed:
-                logger.debug(f"Skipping processed mention: {uri}")
-                continue
-            
             # Get thread containing this post
             post_data = get_post_info(uri)
             if not post_data:
@@ -203,24 +274,50 @@ def filter_unprocessed_mentions(mention_uris: List[str]) -> List[str]:
     logger.info(f"Found {len(unprocessed)} valid unprocessed mentions out of {len(mention_uris)} total")
     return unprocessed
 
+def find_json_arrays(data: str) -> Iterator[str]:
+    """
+    Yield every top-level bracket-balanced [...] span in the text, in order.
+    Single linear scan; brackets inside JSON strings are ignored.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    
+    for i, char in enumerate(data):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '[':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif depth:
+            if char == '"':
+                in_string = True
+            elif char == ']':
+                depth -= 1
+                if depth == 0:
+                    yield data[start:i + 1]
+
 def extract_json_from_output(data: str) -> List[str]:
     """
     Extract JSON from a potentially multi-line output that contains 
     other text besides JSON
     """
-    # Try to find JSON array in the output
-    json_pattern = r'\[.*\]'
-    match = re.search(json_pattern, data, re.DOTALL)
-    
-    if match:
+    # Try each balanced array in the output until one parses as a JSON list
+    for json_str in find_json_arrays(data):
         try:
-            json_str = match.group(0)
-            uris = json.loads(json_str)
+            uris = orjson.loads(json_str)
             if isinstance(uris, list):
                 logger.info(f"Successfully extracted {len(uris)} URIs from JSON in output")
                 return uris
-        except json.JSONDecodeError as e:
-            logger.warning(f"Found JSON-like pattern but failed to parse: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.debug(f"Found JSON-like pattern but failed to parse: {e}")
     
     return []
 
@@ -246,8 +343,7 @@ def read_mention_uris_from_stdin() -> List[str]:
                 return uris
         except json.JSONDecodeError:
             # If not JSON, try looking for URI patterns
-            uri_pattern = r'at://[^\s"]+'
-            uris = re.findall(uri_pattern, data)
+            uris = URI_PATTERN.findall(data)
             if uris:
                 logger.info(f"Extracted {len(uris)} URIs using regex pattern")
                 return uris
@@ -13,8 +13,14 @@ import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from urllib.parse import quote
 
+# Reused across feed requests to keep the connection to the public API alive
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.5)))
+
 def setup_logging(debug=False):
     """Set up basic logging configuration"""
     level = logging.DEBUG if debug else logging.INFO
@@ -63,7 +69,7 @@ class BlueskyAuthorFeedFetcher:
                 params["filter"] = filter
             
             # Make the request
-            response = requests.get(endpoint, params=params)
+            response = _session.get(endpoint, params=params)
             response.raise_for_status()  # Raise exception for HTTP errors
             
             # Parse response
@@ -14,6 +14,19 @@ from datetime import datetime
 from dotenv import load_dotenv
 from atproto import Client
 
+# Login, saved sessions and retry helpers shared by the Bluesky scripts. The second import
+# covers running this file directly, when src/ itself is on the path instead of the repo root
+try:
+    from src.bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+except ImportError:
+    from bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+
+# Load environment variables from .env file once, when the module is imported
+load_dotenv()
+
+# Name of this script's saved login session, see bsky_auth
+SESSION_NAME = "mentions"
+
 def setup_logging():
     """Set up basic logging configuration"""
     logging.basicConfig(
@@ -33,31 +46,27 @@ class BlueskyMentionsChecker:
         self.client = Client()
         self.authenticated = False
         self.did = None
+        # indexed_at of the newest notification already returned, later calls only return newer ones
+        self.seen_until = None
         
         # Authenticate when creating the instance
         self._authenticate()
     
     def _authenticate(self) -> bool:
-        """Authenticate with the Bluesky API"""
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.info(f"Attempting to authenticate as {self.username}")
-                response = self.client.login(self.username, self.password)
-                self.did = response.did
-                self.authenticated = True
-                self.logger.info(f"Authentication successful for {self.username} (DID: {self.did})")
-                return True
-            except Exception as e:
-                self.logger.error(f"Authentication attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-        
-        self.logger.error(f"Authentication failed after {self.max_retries} attempts")
-        return False
+        """Authenticate with the Bluesky API, resuming this script's saved session when possible"""
+        self.did = authenticate(self.client, self.username, self.password, SESSION_NAME,
+                                self.max_retries, self.retry_delay, self.logger)
+        self.authenticated = self.did is not None
+        return self.authenticated
     
-    def get_mentions(self, limit: int = 20) -> List[Any]:
-        """Fetch recent mentions of the authenticated user"""
+    def get_mentions(self, limit: int = 20, max_pages: int = 5) -> List[Any]:
+        """
+        Fetch recent mentions of the authenticated user
+        
+        The first call returns the latest page of notifications. Later calls only return
+        notifications newer than those already seen, following the cursor to older pages
+        until they reach the last seen notification (at most max_pages pages).
+        """
         if not self.authenticated:
             self.logger.error("Cannot fetch mentions: Not authenticated")
             return []
@@ -65,54 +74,84 @@ class BlueskyMentionsChecker:
         try:
             self.logger.info(f"Fetching {limit} recent mentions")
             
-            # Get notifications list
-            response = self.client.app.bsky.notification.list_notifications({
-                'limit': limit
-            })
+            # Once notifications have been seen, probe the newest one first and skip the
+            # full page when nothing new has arrived since the last call
+            if self.seen_until is not None:
+                probe = self.client.app.bsky.notification.list_notifications({'limit': 1})
+                latest = getattr(probe, 'notifications', None)
+                if not latest or latest[0].indexed_at <= self.seen_until:
+                    self.logger.info("No new notifications")
+                    return []
             
-            if not response or not hasattr(response, 'notifications'):
-                self.logger.warning("No notifications returned from API")
-                return []
+            notifications = []
+            cursor = None
+            for _ in range(max_pages):
+                # Get notifications list
+                params = {'limit': limit}
+                if cursor:
+                    params['cursor'] = cursor
+                response = self.client.app.bsky.notification.list_notifications(params)
+                
+                if not response or not hasattr(response, 'notifications'):
+                    self.logger.warning("No notifications returned from API")
+                    break
+                
+                page = response.notifications
+                if self.seen_until is None:
+                    notifications = page
+                    break
+                
+                # Notifications are newest first, so stop paging at the first one already seen
+                new = [n for n in page if n.indexed_at > self.seen_until]
+                notifications.extend(new)
+                if len(new) < len(page) or not response.cursor:
+                    break
+                cursor = response.cursor
+            
+            if notifications:
+                self.seen_until = max(n.indexed_at for n in notifications)
             
             # Filter for mentions only
-            mentions = [n for n in response.notifications if n.reason == 'mention']
+            mentions = [n for n in notifications if n.reason == 'mention']
             
-            # Log details about the response for debugging
-            self.logger.debug(f"Received {len(mentions)} mention notifications")
-            for i, mention in enumerate(mentions[:10], 1):  # Log first 10 mentions for debugging
-                try:
-                    author = mention.author.handle
-                    reason = mention.reason
-                    if hasattr(mention, 'record') and hasattr(mention.record, 'text'):
-                        text = mention.record.text[:50] + "..." if len(mention.record.text) > 50 else mention.record.text
-                    else:
+            # Log details about the response for debugging, only building the messages when they are shown
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Received {len(mentions)} mention notifications")
+                for i, mention in enumerate(mentions[:10], 1):  # Log first 10 mentions for debugging
+                    author = getattr(getattr(mention, 'author', None), 'handle', "Unknown")
+                    reason = getattr(mention, 'reason', None)
+                    text = getattr(getattr(mention, 'record', None), 'text', None)
+                    if text is None:
                         text = "No text available"
+                    elif len(text) > 50:
+                        text = text[:50] + "..."
                     self.logger.debug(f"DEBUG - Mention {i}: from @{author}, reason: {reason}, text: {text}")
-                except Exception as e:
-                    self.logger.error(f"Error parsing mention {i}: {str(e)}")
             
             return mentions
             
         except Exception as e:
             self.logger.error(f"Failed to fetch mentions: {str(e)}")
+            if is_auth_error(e):
+                # The shared checker is rebuilt, and logs in again, on the next call
+                self.authenticated = False
             return []
 
 def format_time(timestamp):
     """Format a timestamp into a readable date/time"""
+    # AT Protocol timestamps are UTC ISO-8601 strings, which only need slicing
+    if len(timestamp) >= 20 and timestamp[10] == 'T' and timestamp.endswith('Z'):
+        return f"{timestamp[:10]} {timestamp[11:19]} UTC"
     dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
     return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
 
 def is_post_a_reply(mention):
     """Determine if a post is a reply by checking its record"""
     # Direct check of the reply field in record
-    if hasattr(mention, 'record') and hasattr(mention.record, 'reply'):
+    if hasattr(getattr(mention, 'record', None), 'reply'):
         return True
     
     # For mentions in notification format
-    if hasattr(mention, 'post') and hasattr(mention.post, 'record') and hasattr(mention.post.record, 'reply'):
-        return True
-    
-    return False
+    return hasattr(getattr(getattr(mention, 'post', None), 'record', None), 'reply')
 
 def process_mentions(client, limit=20):
     """Process recent mentions in notifications"""
@@ -132,22 +171,20 @@ def process_mentions(client, limit=20):
         
         processed_mentions = []
         for i, mention in enumerate(mentions):
-            # Extract post text
-            text = ""
-            if hasattr(mention, 'record') and hasattr(mention.record, 'text'):
-                text = mention.record.text
-            elif hasattr(mention, 'post') and hasattr(mention.post, 'record') and hasattr(mention.post.record, 'text'):
-                text = mention.post.record.text
+            # Extract post text, from the record or from the post in notification format
+            text = getattr(getattr(mention, 'record', None), 'text', None)
+            if text is None:
+                text = getattr(getattr(getattr(mention, 'post', None), 'record', None), 'text', "")
             
             # Get author information
-            author = mention.author.handle if hasattr(mention, 'author') and hasattr(mention.author, 'handle') else "Unknown"
+            author = getattr(getattr(mention, 'author', None), 'handle', "Unknown")
             
             # Get post timestamp
-            indexed_at = mention.indexed_at if hasattr(mention, 'indexed_at') else "Unknown"
+            indexed_at = getattr(mention, 'indexed_at', "Unknown")
             formatted_time = format_time(indexed_at) if indexed_at != "Unknown" else "Unknown"
             
             # Get URI
-            uri = mention.uri if hasattr(mention, 'uri') else None
+            uri = getattr(mention, 'uri', None)
             
             # Check if post is a reply
             is_reply = is_post_a_reply(mention)
@@ -156,7 +193,7 @@ def process_mentions(client, limit=20):
             mention_info = {
                 'index': i+1,
                 'uri': uri,
-                'cid': mention.cid if hasattr(mention, 'cid') else "Unknown",
+                'cid': getattr(mention, 'cid', "Unknown"),
                 'author': author,
                 'time': formatted_time,
                 'text': text,
@@ -171,30 +208,61 @@ def process_mentions(client, limit=20):
         logger.error(f"Error processing mentions: {str(e)}")
         return []
 
+# Shared checker so repeated calls reuse one authenticated session instead of logging in every cycle
+_checker: Optional[BlueskyMentionsChecker] = None
+
+def _get_checker(username: str, password: str) -> BlueskyMentionsChecker:
+    """Return the shared checker, logging in again only if the credentials changed or login failed"""
+    global _checker
+    if _checker is None or not _checker.authenticated or (_checker.username, _checker.password) != (username, password):
+        _checker = BlueskyMentionsChecker(username=username, password=password)
+    return _checker
+
+# Mentions the caller could not finish, in the order they were handed back, with how often they failed.
+# get_mentions only returns notifications newer than the last call, so without this a failed mention would be lost.
+_retry_uris: Dict[str, int] = {}
+# Requeued mentions returned by the last get_mentions() call, so a repeated failure adds to their count
+_retrying: Dict[str, int] = {}
+# A mention that failed this many times is given up on instead of being fetched every cycle
+MAX_MENTION_ATTEMPTS = 3
+
+def requeue_mention(uri: str) -> None:
+    """Hand back a mention whose processing failed, so the next get_mentions() call returns it again"""
+    attempts = _retrying.pop(uri, 0) + 1
+    if attempts >= MAX_MENTION_ATTEMPTS:
+        logging.getLogger(__name__).warning(f"Giving up on mention {uri} after {attempts} failed attempts")
+        return
+    _retry_uris[uri] = attempts
+
 def get_mentions() -> List[str]:
-    """Main interface function that returns a list of mention URIs"""
+    """Main interface function that returns a list of mention URIs, including any handed back with requeue_mention"""
     logger = setup_logging()
-    load_dotenv()
     
     try:
-        username = os.environ.get("BSKY_BOT_USERNAME")
-        password = os.environ.get("BSKY_BOT_PASSWORD")
+        username, password = bot_credentials()
         
         if not username or not password:
             logger.error("Missing Bluesky credentials in environment variables")
             return []
             
-        client = BlueskyMentionsChecker(
-            username=username,
-            password=password
-        )
+        client = _get_checker(username, password)
         
         if not client.authenticated:
             logger.error("Failed to authenticate with Bluesky")
             return []
         
         mentions = process_mentions(client)
-        return [mention['uri'] for mention in mentions if mention['uri']]
+        uris = [mention['uri'] for mention in mentions if mention['uri']]
+        
+        # Mentions that failed last time come after the new ones
+        # Anything left from the previous batch was not handed back, so it succeeded
+        _retrying.clear()
+        if _retry_uris:
+            logger.info(f"Retrying {len(_retry_uris)} mentions that were not processed")
+            uris += [uri for uri in _retry_uris if uri not in uris]
+            _retrying.update(_retry_uris)
+            _retry_uris.clear()
+        return uris
         
     except Exception as e:
         logger.error(f"Error getting mentions: {str(e)}")
@@ -205,14 +273,10 @@ def main():
     # Set up logging
     logger = setup_logging()
     
-    # Load environment variables
-    load_dotenv()
-    
     # Initialize Bluesky client
     try:
         # Use BSKY_BOT_USERNAME and BSKY_BOT_PASSWORD as specified in instructions
-        username = os.environ.get("BSKY_BOT_USERNAME")
-        password = os.environ.get("BSKY_BOT_PASSWORD")
+        username, password = bot_credentials()
         
         if not username or not password:
             logger.error("Missing Bluesky credentials in environment variables")
@@ -9,18 +9,39 @@ import os
 import sys
 import logging
 import time
+import threading
+import tempfile
 import json
+from concurrent.futures import Future
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from dotenv import load_dotenv
 from atproto import Client
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from pathlib import Path
 
+# Login, saved sessions and retry helpers shared by the Bluesky scripts. The second import
+# covers running this file directly, when src/ itself is on the path instead of the repo root
+try:
+    from src.bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+except ImportError:
+    from bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+
+# Load environment variables from .env file once, when the module is imported
+load_dotenv()
+
+# Shared session so public API thread lookups reuse one keep-alive connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.5)))
+
 # Setup data directories
 DATA_DIR = Path(os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"))
 POSTS_DIR = DATA_DIR / "posts"
+# Name of this script's saved login session, see bsky_auth
+SESSION_NAME = "thread"
 
 def ensure_dirs():
     """Ensure required directories exist"""
@@ -89,9 +110,10 @@ def save_thread_json(thread_structure: Dict[str, Any]) -> bool:
         
         file_path = author_dir / f"{rkey}.json"
 
+        # Saved for an earlier mention in the same thread, or for an earlier attempt at this one
         if file_path.exists():
-            logging.warning(f"Thread JSON file already exists: {file_path}")
-            return False
+            logging.info(f"Thread JSON file already exists: {file_path}")
+            return True
         
         # Add metadata
         thread_data = {
@@ -99,8 +121,19 @@ def save_thread_json(thread_structure: Dict[str, Any]) -> bool:
             'thread': thread_structure
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(thread_data, f, indent=2, ensure_ascii=False)
+        # Threads are fetched concurrently and mentions in one thread share this file, so it is
+        # written to a private temporary file and then linked into place, which fails if another
+        # caller published it first. Readers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=author_dir, suffix=".json.tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(thread_data, f, indent=2, ensure_ascii=False)
+            os.link(tmp_path, file_path)
+        except FileExistsError:
+            logging.info(f"Thread JSON file was saved concurrently: {file_path}")
+            return True
+        finally:
+            os.remove(tmp_path)
             
         logging.info(f"Saved thread to {file_path}")
         return True
@@ -141,23 +174,11 @@ class BlueskyThreadFetcher:
             self._authenticate()
     
     def _authenticate(self) -> bool:
-        """Authenticate with the Bluesky API"""
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.info(f"Attempting to authenticate as {self.username}")
-                response = self.client.login(self.username, self.password)
-                self.did = response.did
-                self.authenticated = True
-                self.logger.info(f"Authentication successful for {self.username} (DID: {self.did})")
-                return True
-            except Exception as e:
-                self.logger.error(f"Authentication attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-        
-        self.logger.error(f"Authentication failed after {self.max_retries} attempts")
-        return False
+        """Authenticate with the Bluesky API, resuming this script's saved session when possible"""
+        self.did = authenticate(self.client, self.username, self.password, SESSION_NAME,
+                                self.max_retries, self.retry_delay, self.logger)
+        self.authenticated = self.did is not None
+        return self.authenticated
     
     def get_post(self, uri: str) -> Optional[Any]:
         """Fetch a specific post by URI"""
@@ -223,6 +244,9 @@ class BlueskyThreadFetcher:
             
         except Exception as e:
             self.logger.error(f"Failed to fetch post thread: {str(e)}")
+            if is_auth_error(e) and self.username:
+                # Makes _get_fetcher replace the shared authenticated fetcher on the next call
+                self.authenticated = False
             return None
             
     def _get_thread_via_public_api(self, uri: str, depth: int = 5, parent_height: int = 20) -> Optional[Any]:
@@ -239,7 +263,7 @@ class BlueskyThreadFetcher:
             }
             
             # Make the request
-            response = requests.get(endpoint, params=params)
+            response = _session.get(endpoint, params=params)
             response.raise_for_status()
             
             # Convert the JSON response to an object that matches the atproto client's response structure
@@ -282,6 +306,9 @@ class BlueskyThreadFetcher:
 
 def format_time(timestamp):
     """Format a timestamp into a readable date/time"""
+    # AT Protocol timestamps are UTC ISO-8601 strings, which only need slicing
+    if len(timestamp) >= 20 and timestamp[10] == 'T' and timestamp.endswith('Z'):
+        return f"{timestamp[:10]} {timestamp[11:19]} UTC"
     dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
     return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
 
@@ -289,27 +316,27 @@ def process_post_info(post_view) -> Dict[str, Any]:
     """Extract key information from a post view"""
     try:
         # Get author information
-        author = post_view.author.handle if hasattr(post_view, 'author') and hasattr(post_view.author, 'handle') else "Unknown"
-        display_name = post_view.author.display_name if hasattr(post_view, 'author') and hasattr(post_view.author, 'display_name') else None
+        author_view = getattr(post_view, 'author', None)
+        author = getattr(author_view, 'handle', "Unknown")
+        display_name = getattr(author_view, 'display_name', None)
         
         # Get post text and timestamp
-        text = post_view.record.text if hasattr(post_view, 'record') and hasattr(post_view.record, 'text') else ""
-        indexed_at = post_view.indexed_at if hasattr(post_view, 'indexed_at') else None
+        record = getattr(post_view, 'record', None)
+        text = getattr(record, 'text', "")
+        indexed_at = getattr(post_view, 'indexed_at', None)
         formatted_time = format_time(indexed_at) if indexed_at else "Unknown"
         
         # Get post identifiers
-        uri = post_view.uri if hasattr(post_view, 'uri') else None
-        cid = post_view.cid if hasattr(post_view, 'cid') else None
+        uri = getattr(post_view, 'uri', None)
+        cid = getattr(post_view, 'cid', None)
         
         # Check if post is a reply
-        is_reply = False
-        if hasattr(post_view, 'record') and hasattr(post_view.record, 'reply'):
-            is_reply = True
+        is_reply = hasattr(record, 'reply')
         
         # Check for engagement metrics
-        like_count = post_view.like_count if hasattr(post_view, 'like_count') else 0
-        reply_count = post_view.reply_count if hasattr(post_view, 'reply_count') else 0
-        repost_count = post_view.repost_count if hasattr(post_view, 'repost_count') else 0
+        like_count = getattr(post_view, 'like_count', 0)
+        reply_count = getattr(post_view, 'reply_count', 0)
+        repost_count = getattr(post_view, 'repost_count', 0)
         
         return {
             'author': author,
@@ -446,25 +473,69 @@ def print_thread_summary(thread_structure, detailed=False):
     
     print("="*80 + "\n")
 
+# Shared fetchers, so the public one is reused and the authenticated fallback logs in only once.
+# Threads may be fetched concurrently, so the fetchers are created under a lock.
+_public_fetcher: Optional[BlueskyThreadFetcher] = None
+_auth_fetcher: Optional[BlueskyThreadFetcher] = None
+_fetcher_lock = threading.Lock()
+
+def _get_fetcher(username: str = None, password: str = None) -> BlueskyThreadFetcher:
+    """Return the shared public fetcher, or the shared authenticated one when credentials are given"""
+    global _public_fetcher, _auth_fetcher
+    with _fetcher_lock:
+        if not (username and password):
+            if _public_fetcher is None:
+                _public_fetcher = BlueskyThreadFetcher()
+            return _public_fetcher
+        if _auth_fetcher is None or not _auth_fetcher.authenticated or (_auth_fetcher.username, _auth_fetcher.password) != (username, password):
+            _auth_fetcher = BlueskyThreadFetcher(username=username, password=password)
+        return _auth_fetcher
+
+# Thread fetches currently in progress, keyed by post URI, so concurrent requests for the
+# same post share a single fetch instead of each hitting the API
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
 def get_thread(uri: str, debug: bool = False) -> Dict[str, Any]:
     """Main function to retrieve a thread that can be called from external code"""
+    with _inflight_lock:
+        future = _inflight.get(uri)
+        owner = future is None
+        if owner:
+            future = _inflight[uri] = Future()
+    
+    # Another caller is already fetching this thread, wait for its result
+    if not owner:
+        return future.result()
+    
+    try:
+        result = _fetch_thread(uri, debug)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[uri]
+
+def _fetch_thread(uri: str, debug: bool = False) -> Dict[str, Any]:
+    """Fetch, structure and save the thread for a post URI"""
     logger = setup_logging(debug)
     ensure_dirs()  # Ensure directories exist
-    load_dotenv()  # Load environment variables
     
     try:
         # Try with public API first
-        client = BlueskyThreadFetcher()
+        client = _get_fetcher()
         thread_response = client.get_post_thread(uri, depth=5, parent_height=20)
         
         # If public API fails, try with authentication
         if not thread_response:
             logger.info("Public API failed, trying with authentication...")
-            username = os.environ.get("BSKY_BOT_USERNAME")
-            password = os.environ.get("BSKY_BOT_PASSWORD")
+            username, password = bot_credentials()
             
             if username and password:
-                client = BlueskyThreadFetcher(username=username, password=password)
+                client = _get_fetcher(username, password)
                 thread_response = client.get_post_thread(uri, depth=5, parent_height=20)
         
         if not thread_response:
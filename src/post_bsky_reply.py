@@ -12,10 +12,23 @@ import sys
 import logging
 import time
 import datetime
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 from atproto import Client
 
+# Login, saved sessions and retry helpers shared by the Bluesky scripts. The second import
+# covers running this file directly, when src/ itself is on the path instead of the repo root
+try:
+    from src.bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+except ImportError:
+    from bsky_auth import authenticate, backoff_delay, bot_credentials, is_auth_error
+
+# Load environment variables from .env file once, when the module is imported
+load_dotenv()
+
+# Name of this script's saved login session, see bsky_auth
+SESSION_NAME = "reply"
+
 def setup_logging():
     """Set up basic logging configuration"""
     logging.basicConfig(
@@ -37,6 +50,12 @@ def sanitize_text(text: str) -> str:
         # If encoding fails, just return the original text
         return text
 
+# Collection and record type of reply posts
+POST_COLLECTION = 'app.bsky.feed.post'
+
+# Post URI -> CID for posts that have been replied to, shared across retries and replies
+_cid_cache: Dict[str, str] = {}
+
 class BlueskyReplier:
     def __init__(self, username: str, password: str, max_retries: int = 3, retry_delay: int = 5):
         self.logger = logging.getLogger(__name__)
@@ -52,24 +71,12 @@ class BlueskyReplier:
         self._authenticate()
     
     def _authenticate(self) -> bool:
-        """Authenticate with the Bluesky API"""
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.info(f"Attempting to authenticate as {self.username}")
-                response = self.client.login(self.username, self.password)
-                self.did = response.did
-                self.authenticated = True
-                self.logger.info(f"Authentication successful for {self.username} (DID: {self.did})")
-                return True
-            except Exception as e:
-                self.logger.error(f"Authentication attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-        
-        self.logger.error(f"Authentication failed after {self.max_retries} attempts")
-        return False
-
+        """Authenticate with the Bluesky API, resuming this script's saved session when possible"""
+        self.did = authenticate(self.client, self.username, self.password, SESSION_NAME,
+                                self.max_retries, self.retry_delay, self.logger)
+        self.authenticated = self.did is not None
+        return self.authenticated
+    
     def post_reply(self, parent_uri: str, reply_text: str) -> bool:
         """
         Post a reply to a Bluesky post
@@ -100,33 +107,39 @@ class BlueskyReplier:
                 return False
             
             # Create the reply
+            body = None
             for attempt in range(self.max_retries):
                 try:
-                    # Get the parent post thread for reference
-                    parent_thread = self.client.app.bsky.feed.get_post_thread({'uri': parent_uri})
-                    parent_post = parent_thread.thread.post
-                    
-                    # Sanitize text while preserving emojis
-                    sanitized_text = sanitize_text(reply_text)
-                    
-                    # Create reply record - note the correct parameter structure and createdAt
-                    response = self.client.app.bsky.feed.post.create(
-                        self.did,
-                        {
-                            'text': sanitized_text,
-                            'createdAt': datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                            'reply': {
-                                'root': {
-                                    'uri': parent_uri,
-                                    'cid': parent_post.cid
-                                },
-                                'parent': {
-                                    'uri': parent_uri,
-                                    'cid': parent_post.cid
-                                }
+                    # The request body is built once and resent unchanged on retries
+                    if body is None:
+                        # A post's CID never changes, so each parent is looked up at most once
+                        parent_cid = _cid_cache.get(parent_uri)
+                        if parent_cid is None:
+                            # Only the post itself is needed, not its replies or parents
+                            parent_thread = self.client.app.bsky.feed.get_post_thread({
+                                'uri': parent_uri,
+                                'depth': 0,
+                                'parentHeight': 0
+                            })
+                            parent_cid = _cid_cache[parent_uri] = parent_thread.thread.post.cid
+                        
+                        # The parent is also the thread root the reply is attached to
+                        parent_ref = {'uri': parent_uri, 'cid': parent_cid}
+                        
+                        # Plain dict with an explicit $type, so no post Record model is built per reply
+                        body = {
+                            'repo': self.did,
+                            'collection': POST_COLLECTION,
+                            'record': {
+                                '$type': POST_COLLECTION,
+                                'text': sanitize_text(reply_text),  # Keeps emojis intact
+                                'createdAt': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                                'reply': {'root': parent_ref, 'parent': parent_ref}
                             }
                         }
-                    )
+                    
+                    # Write the reply record straight into the bot's repo
+                    response = self.client.com.atproto.repo.create_record(body)
                     
                     self.logger.info("Reply posted successfully")
                     self.logger.debug(f"Response: {response}")
@@ -134,9 +147,14 @@ class BlueskyReplier:
                     
                 except Exception as e:
                     self.logger.error(f"Attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
+                    if is_auth_error(e):
+                        # Retrying with the same session cannot succeed, the next reply logs in again
+                        self.authenticated = False
+                        return False
                     if attempt < self.max_retries - 1:
-                        self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                        time.sleep(self.retry_delay)
+                        delay = backoff_delay(self.retry_delay, attempt)
+                        self.logger.info(f"Retrying in {delay:.1f} seconds...")
+                        time.sleep(delay)
             
             self.logger.error(f"Failed to post reply after {self.max_retries} attempts")
             return False
@@ -167,6 +185,16 @@ class BlueskyReplier:
             self.logger.error(f"Error parsing URI {uri}: {str(e)}")
             return None, None, None
 
+# Shared replier so repeated replies reuse one authenticated session instead of logging in per reply
+_replier: Optional[BlueskyReplier] = None
+
+def _get_replier(username: str, password: str) -> BlueskyReplier:
+    """Return the shared replier, logging in again only if the credentials changed or login failed"""
+    global _replier
+    if _replier is None or not _replier.authenticated or (_replier.username, _replier.password) != (username, password):
+        _replier = BlueskyReplier(username=username, password=password)
+    return _replier
+
 def post_reply(post_uri: str, reply_text: str, debug: bool = False) -> bool:
     """
     Main interface function to post a reply to a Bluesky post
@@ -185,19 +213,15 @@ def post_reply(post_uri: str, reply_text: str, debug: bool = False) -> bool:
         logger.setLevel(logging.DEBUG)
     
     try:
-        # Load environment variables
-        load_dotenv()
-        
         # Get credentials
-        username = os.environ.get("BSKY_BOT_USERNAME")
-        password = os.environ.get("BSKY_BOT_PASSWORD")
+        username, password = bot_credentials()
         
         if not username or not password:
             logger.error("Missing Bluesky credentials in environment variables")
             return False
         
         # Initialize replier
-        replier = BlueskyReplier(username=username, password=password)
+        replier = _get_replier(username, password)
         
         if not replier.authenticated:
             logger.error("Failed to authenticate with Bluesky")
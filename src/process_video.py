@@ -3,18 +3,36 @@
 Standalone script to process downloaded videos from Bluesky posts.
 This script handles audio extraction, transcription, and frame extraction from videos.
 """
+import io
 import os
 import sys
 import json
+import hashlib
 import logging
+import tarfile
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+from dataclasses import dataclass
 from dotenv import load_dotenv
 import cv2
+import httpx
+import orjson
+import numpy as np
 from openai import AzureOpenAI
 
+# Encode JPEGs with libjpeg-turbo's SIMD encoder when PyTurboJPEG is installed
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420, TJFLAG_PROGRESSIVE
+except ImportError:
+    TurboJPEG = None
+
+# Frames are decoded sparsely and encoded on the JPEG pool, so OpenCV's own thread pool
+# would only compete with it for cores
+cv2.setNumThreads(1)
+
 def setup_logging(debug=False):
     """Set up basic logging configuration"""
     level = logging.DEBUG if debug else logging.INFO
@@ -25,12 +43,57 @@ def setup_logging(debug=False):
     )
     return logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class VideoPaths:
+    """Output locations derived once from a video file path"""
+    video: str
+    base_name: str
+    audio_path: str
+    frames_dir: str
+    transcript_path: str
+
 class VideoProcessor:
     """Class to handle video processing tasks"""
     
-    def __init__(self, output_dir: str = "data/processed_videos"):
+    # Only the first chunk of the video is hashed for the cache key
+    CACHE_HASH_BYTES = 16 * 1024 * 1024
+    # Maximum number of cached results kept before the oldest are evicted
+    CACHE_MAX_ENTRIES = 256
+    # Interval frames within this fraction of a segment's length from its middle replace the middle frame
+    ALIGN_TOLERANCE = 0.25
+    # Whisper resamples to 16 kHz mono anyway, so a small mono MP3 is all it needs
+    AUDIO_CODEC_ARGS = ["-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "64k"]
+    
+    def __init__(self, output_dir: str = "data/processed_videos", max_frame_edge: Optional[int] = 768):
         self.logger = logging.getLogger(__name__ + ".VideoProcessor")
         self.output_dir = output_dir
+        # Frames only feed the vision model, so larger frames are downscaled to this longest edge
+        self.max_frame_edge = max_frame_edge
+        self.cache_dir = os.path.join(output_dir, "cache")
+        self.audio_dir = os.path.join(output_dir, "audio")
+        self.frames_root = os.path.join(output_dir, "frames")
+        self.transcripts_dir = os.path.join(output_dir, "transcripts")
+        
+        # Create the shared output directories once instead of on every call
+        for directory in (self.audio_dir, self.frames_root, self.transcripts_dir):
+            os.makedirs(directory, exist_ok=True)
+        
+        # Explicit ffmpeg thread count instead of relying on ffmpeg's per-codec defaults
+        self.ffmpeg_threads = str(min(os.cpu_count() or 1, 8))
+        
+        # JPEG encoding releases the GIL, so frames are encoded and written on a small
+        # shared thread pool while the next frame is being decoded
+        self.jpeg_workers = min(4, os.cpu_count() or 1)
+        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+        self._jpeg_pool = ThreadPoolExecutor(max_workers=self.jpeg_workers, thread_name_prefix="jpeg")
+        self._turbo = None
+        if TurboJPEG is not None:
+            try:
+                self._turbo = TurboJPEG()
+            except Exception as e:
+                self.logger.warning(f"libjpeg-turbo not available, encoding frames with OpenCV: {str(e)}")
+        # Runs the Whisper request while frames are being extracted
+        self._transcribe_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcribe")
         
         # Load environment variables
         load_dotenv()
@@ -44,49 +107,83 @@ class VideoProcessor:
         self.azure_client = None
         if all([azure_endpoint, whisper_api_key, whisper_api_version]):
             self.logger.info("Azure OpenAI API credentials configured")
+            # One pooled HTTP/2 connection is kept alive and reused for every transcription
             self.azure_client = AzureOpenAI(
                 api_key=whisper_api_key,
                 azure_endpoint=azure_endpoint,
-                api_version=whisper_api_version
+                api_version=whisper_api_version,
+                http_client=httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                    timeout=300
+                )
             )
         else:
             self.logger.warning("Azure OpenAI API credentials not provided, transcription will not work")
 
-    def extract_audio(self, video_path: str) -> Optional[str]:
+    def _run_ffmpeg(self, cmd: List[str]) -> None:
+        """
+        Run an ffmpeg command, discarding stdout and keeping only error output
+        
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg exits with a non-zero code
+        """
+        # Progress output is suppressed so the stderr pipe only carries errors,
+        # which communicate() drains with a large buffer instead of the default 8 KiB
+        cmd = [cmd[0], "-nostdin", "-hide_banner", "-loglevel", "error"] + cmd[1:]
+        self.logger.debug(f"Running command: {' '.join(cmd)}")
+        
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20
+        ) as process:
+            _, stderr = process.communicate()
+        
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, cmd, stderr=stderr.decode('utf-8', errors='replace')
+            )
+
+    def video_paths(self, video_path: str) -> VideoPaths:
+        """Derive all output paths for a video in one pass"""
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        return VideoPaths(
+            video=video_path,
+            base_name=base_name,
+            audio_path=os.path.join(self.audio_dir, f"{base_name}.mp3"),
+            frames_dir=os.path.join(self.frames_root, base_name),
+            transcript_path=os.path.join(self.transcripts_dir, f"{base_name}_transcript.json")
+        )
+
+    def extract_audio(self, video_path: str, paths: Optional[VideoPaths] = None) -> Optional[str]:
         """Extract audio from a video file"""
         try:
             self.logger.info(f"Extracting audio from: {video_path}")
             
-            # Create output directory
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            output_dir = os.path.join(self.output_dir, "audio")
-            os.makedirs(output_dir, exist_ok=True)
-            
             # Output path for the audio file
-            output_path = os.path.join(output_dir, f"{base_name}.mp3")
+            paths = paths or self.video_paths(video_path)
+            output_path = paths.audio_path
             
             # Run ffmpeg to extract audio
             self.logger.debug(f"Running ffmpeg to extract audio to {output_path}")
             cmd = [
-                "ffmpeg", "-i", video_path,
-                "-q:a", "0", "-map", "a", "-y",
+                # Audio-only decode and encode gain little from more than a couple of threads
+                "ffmpeg", "-threads", "2", "-filter_threads", "2", "-i", video_path,
+                "-vn", "-map", "a", *self.AUDIO_CODEC_ARGS, "-y",
                 output_path
             ]
             
             # Execute the command
-            process = subprocess.run(
-                cmd, 
-                check=True, 
-                capture_output=True,
-                text=True
-            )
+            self._run_ffmpeg(cmd)
             
             self.logger.info(f"Audio extraction completed successfully: {output_path}")
             return output_path
             
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Error extracting audio with ffmpeg: {str(e)}")
-            self.logger.error(f"STDOUT: {e.stdout}")
             self.logger.error(f"STDERR: {e.stderr}")
             return None
             
@@ -94,8 +191,23 @@ class VideoProcessor:
             self.logger.error(f"Unexpected error extracting audio: {str(e)}")
             return None
 
-    def transcribe_audio(self, audio_path: str, language: str = "en") -> Optional[Dict[str, Any]]:
-        """Transcribe audio using Azure OpenAI Whisper API"""
+    def _save_transcript(self, transcript: Dict[str, Any]) -> None:
+        """Write a transcript to its transcript_path"""
+        # Write next to the target and rename, so readers never see a partially written transcript
+        transcript_path = transcript["transcript_path"]
+        tmp_path = f"{transcript_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(transcript, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, transcript_path)
+
+    def transcribe_audio(self, audio_path: str, language: str = "en", save: bool = True,
+                         paths: Optional[VideoPaths] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribe audio using Azure OpenAI Whisper API
+        
+        With save=False a new transcript is only returned, and the caller is
+        responsible for writing it once it is complete.
+        """
         try:
             if not self.azure_client:
                 self.logger.error("Cannot transcribe without Azure OpenAI client")
@@ -103,26 +215,24 @@ class VideoProcessor:
                 
             self.logger.info(f"Transcribing audio: {audio_path} (language: {language})")
             
-            # Extract video_id from audio path
-            video_id = os.path.splitext(os.path.basename(audio_path))[0]
+            # The audio file is named after the video, so its paths can be derived from it when not given
+            paths = paths or self.video_paths(audio_path)
+            filename = os.path.basename(audio_path)
+            video_id = paths.base_name
             
             # Ensure the audio file exists
             if not os.path.exists(audio_path):
                 self.logger.error(f"Audio file not found: {audio_path}")
                 return None
                 
-            # Create output directory for transcripts
-            output_dir = os.path.join(self.output_dir, "transcripts")
-            os.makedirs(output_dir, exist_ok=True)
-            
             # Path for saving transcript
-            transcript_path = os.path.join(output_dir, f"{video_id}_transcript.json")
+            transcript_path = paths.transcript_path
             
             # Check if transcription already exists
             if os.path.exists(transcript_path):
                 self.logger.info(f"Transcription already exists at {transcript_path}")
-                with open(transcript_path, 'r') as f:
-                    return json.load(f)
+                with open(transcript_path, 'rb') as f:
+                    return orjson.loads(f.read())
             
             # Transcribe using Azure OpenAI's API
             with open(audio_path, "rb") as audio_file:
@@ -135,66 +245,170 @@ class VideoProcessor:
                     timestamp_granularities=['word', 'segment']
                 )
             
+            # Convert the response to plain dicts in one pass instead of reading model attributes per item
+            dump = response.model_dump()
+            
+            def durations(items: List[Dict[str, Any]]) -> List[float]:
+                """Round end - start for every item in one vectorized pass"""
+                starts = np.fromiter((item['start'] for item in items), dtype=np.float64, count=len(items))
+                ends = np.fromiter((item['end'] for item in items), dtype=np.float64, count=len(items))
+                return np.round(ends - starts, 3).tolist()
+            
             # Extract word-level data
-            words_data = []
-            if hasattr(response, 'words'):
-                for word in response.words:
-                    word_data = {
-                        'text': word.word,
-                        'start': word.start,
-                        'end': word.end,
-                        'duration': round(word.end - word.start, 3)
-                    }
-                    words_data.append(word_data)
-            
-            # Extract segment-level data
-            segments_data = []
-            if hasattr(response, 'segments'):
-                for segment in response.segments:
-                    segment_data = {
-                        'text': segment.text,
-                        'start': segment.start,
-                        'end': segment.end,
-                        'duration': round(segment.end - segment.start, 3),
-                        'frames': []  # Will be populated after frame extraction
-                    }
-                    segments_data.append(segment_data)
+            words = dump.get('words') or []
+            words_data = [
+                {'text': w['word'], 'start': w['start'], 'end': w['end'], 'duration': duration}
+                for w, duration in zip(words, durations(words))
+            ]
+            
+            # Extract segment-level data (frames are populated after frame extraction)
+            segments = dump.get('segments') or []
+            segments_data = [
+                {'text': seg['text'], 'start': seg['start'], 'end': seg['end'], 'duration': duration, 'frames': []}
+                for seg, duration in zip(segments, durations(segments))
+            ]
             
             # Format transcript data
             transcript_data = {
                 'metadata': {
                     'video_id': video_id,
-                    'filename': os.path.basename(audio_path),
+                    'filename': filename,
                     'filepath': os.path.abspath(audio_path),
                     'language': language,
-                    'duration': round(response.duration if hasattr(response, 'duration') else 0, 2)
+                    'duration': round(dump.get('duration') or 0, 2)
                 },
-                'text': response.text,
+                'text': dump['text'],
                 'segments': segments_data,
                 'words': words_data,
                 'transcript_path': transcript_path
             }
             
             # Save transcript to file
-            with open(transcript_path, 'w') as f:
-                json.dump(transcript_data, f, indent=2)
-                
-            self.logger.info(f"Transcription completed and saved to: {transcript_path}")
+            if save:
+                self._save_transcript(transcript_data)
+                self.logger.info(f"Transcription completed and saved to: {transcript_path}")
+            else:
+                self.logger.info("Transcription completed")
             return transcript_data
             
         except Exception as e:
             self.logger.error(f"Error transcribing audio: {str(e)}")
             return None
 
-    def extract_frames(self, video_path: str, transcript: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Extract key frames from video"""
+    def _probe(self, video_path: str) -> Optional[Dict[str, Any]]:
+        """Read video stream properties from the container header with ffprobe"""
+        cmd = [
+            "ffprobe", "-v", "quiet", "-print_format", "json",
+            "-show_streams", "-select_streams", "v:0",
+            # MKV/WebM and some TS muxers only record the duration on the container
+            "-show_entries", "format=duration",
+            video_path
+        ]
+        
+        try:
+            process = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            probed = json.loads(process.stdout)
+            streams = probed.get("streams", [])
+            if not streams:
+                self.logger.warning(f"ffprobe found no video stream in: {video_path}")
+                return None
+            stream = streams[0]
+            
+            # r_frame_rate is a fraction such as "30000/1001"
+            num, _, den = stream.get("r_frame_rate", "0/1").partition("/")
+            fps = float(num) / float(den or 1) if float(den or 1) else 0.0
+            duration = float(stream.get("duration", 0) or probed.get("format", {}).get("duration", 0) or 0)
+            frame_count = int(stream.get("nb_frames", 0) or 0) or int(duration * fps)
+            duration = duration or (frame_count / fps if fps > 0 else 0)
+            
+            # Zero means the header does not say, so let the caller fall back to the capture
+            if duration <= 0:
+                self.logger.debug(f"ffprobe reported no duration for {video_path}")
+                return None
+            
+            return {
+                "fps": fps,
+                "frame_count": frame_count,
+                "duration": duration,
+                "width": int(stream.get("width", 0)),
+                "height": int(stream.get("height", 0))
+            }
+            
+        except Exception as e:
+            self.logger.warning(f"ffprobe failed for {video_path}: {str(e)}")
+            return None
+
+    def _fit_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame so its longest edge is at most max_frame_edge"""
+        height, width = frame.shape[:2]
+        if not self.max_frame_edge or max(height, width) <= self.max_frame_edge:
+            return frame
+        scale = self.max_frame_edge / max(height, width)
+        return cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    def _encode_jpeg(self, frame: np.ndarray) -> Optional[Any]:
+        """Encode a frame as JPEG, returning a bytes-like buffer or None if encoding failed"""
+        frame = self._fit_frame(frame)
+        if self._turbo is not None:
+            return self._turbo.encode(frame, quality=85, jpeg_subsample=TJSAMP_420, flags=TJFLAG_PROGRESSIVE)
+        success, buffer = cv2.imencode(".jpg", frame, self.jpeg_params)
+        return buffer if success else None
+
+    def _write_frame(self, frame_path: str, frame: np.ndarray) -> bool:
+        """Encode a frame as JPEG and write it to disk"""
+        # Encode in memory and write with a single unbuffered os.write instead of imwrite's stdio file
+        buffer = self._encode_jpeg(frame)
+        if buffer is None:
+            return False
+        fd = os.open(frame_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(buffer).cast("B")
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        return True
+
+    def _encode_frame(self, frame_path: str, frame: np.ndarray) -> Optional[bytes]:
+        """Encode a frame as JPEG in memory, returning None if encoding failed"""
+        buffer = self._encode_jpeg(frame)
+        return bytes(buffer) if buffer is not None else None
+
+    def extract_frames(self, video_path: str, transcript: Optional[Dict[str, Any]] = None,
+                       tar_frames: bool = False, paths: Optional[VideoPaths] = None,
+                       segment_indices: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Extract key frames from video
+        
+        With tar_frames the JPEGs are packed into a single <frames_dir>.tar instead of
+        one file each; frame_paths then holds the tar path and each segment frame's
+        frame_path is its member name inside the archive.
+        
+        segment_indices gives the index in the full transcript of each entry in
+        transcript["segments"], for when only some of its segments are passed in.
+        """
         try:
             self.logger.info(f"Extracting frames from video: {video_path}")
             
-            # Create output directory for frames
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            frames_dir = os.path.join(self.output_dir, "frames", base_name)
-            os.makedirs(frames_dir, exist_ok=True)
+            # Create output directory for frames (a tar archive lives next to it instead)
+            frames_dir = (paths or self.video_paths(video_path)).frames_dir
+            if not tar_frames:
+                os.makedirs(frames_dir, exist_ok=True)
+            write_frame = self._encode_frame if tar_frames else self._write_frame
+            # Joined once, so the frame loops only format the per-frame file name
+            frame_prefix = os.path.join(frames_dir, "frame_")
+            
+            # Segment frames are placed by transcript timestamps, so frame rate, frame count and
+            # duration are only needed for interval extraction and are not queried otherwise
+            has_segments = bool(transcript and transcript.get("segments"))
+            
+            # Get video properties from the container header, without opening a decoder
+            properties = None if has_segments else self._probe(video_path)
+            
+            # Without segments frames are taken on whole seconds, so a sub-second video has nothing to decode
+            if properties and int(properties["duration"]) == 0:
+                self.logger.info("Video is shorter than one second, no frames to extract")
+                return {"frame_paths": [], "segment_frames": []}
             
             # Open the video file
             cap = cv2.VideoCapture(video_path)
@@ -202,51 +416,110 @@ class VideoProcessor:
                 self.logger.error(f"Could not open video: {video_path}")
                 return {"frame_paths": [], "segment_frames": []}
             
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            duration = frame_count / fps if fps > 0 else 0
-            
-            self.logger.info(f"Video properties: {frame_count} frames, {fps} fps, {duration:.2f}s duration")
+            if properties:
+                duration = properties["duration"]
+                width = properties["width"]
+                height = properties["height"]
+                self.logger.info(f"Video properties: {properties['frame_count']} frames, {properties['fps']} fps, {duration:.2f}s duration")
+            else:
+                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                if not has_segments:
+                    # Fall back to the capture, which may have to walk the container index for the frame count
+                    fps = cap.get(cv2.CAP_PROP_FPS)
+                    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                    duration = frame_count / fps if fps > 0 else 0
+                    self.logger.info(f"Video properties: {frame_count} frames, {fps} fps, {duration:.2f}s duration")
+            
+            # Pre-allocate a small pool of frame buffers that cap.read() decodes into, instead of
+            # letting OpenCV allocate a fresh array per frame. Each decoded buffer is handed to the
+            # encoder without a copy and only decoded into again once its previous write finished.
+            pool_size = self.jpeg_workers + 1
+            if width > 0 and height > 0:
+                frame_buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(pool_size)]
+            else:
+                frame_buffers = [None] * pool_size
+            buffer_writes = [None] * pool_size  # future of the last write using each buffer
+            
+            def read_frame(slot: int, skip: int = 0) -> Tuple[bool, Any]:
+                """Skip `skip` frames, then decode the next one into a pool buffer once it is free again"""
+                for _ in range(skip):
+                    # grab() demuxes and decodes without the color conversion retrieve() does
+                    if not cap.grab():
+                        return False, None
+                if buffer_writes[slot] is not None:
+                    buffer_writes[slot].result()
+                return cap.read(frame_buffers[slot])
             
             frame_paths = []
             segment_frames = []  # Store frame info with segment index and timestamp
             
+            # Checked once so the frame loops skip formatting per-frame debug messages
+            log_frames = self.logger.isEnabledFor(logging.DEBUG)
+            
+            pending = {}  # frame_path -> future of the write
+            
             # If we have a transcript with segments, use those timestamps for keyframes
-            if transcript and "segments" in transcript and transcript["segments"]:
+            if has_segments:
                 self.logger.info(f"Extracting frames based on {len(transcript['segments'])} transcript segments")
                 
-                for i, segment in enumerate(transcript["segments"]):
-                    if "start" in segment and "end" in segment:
-                        # Calculate middle point of the segment
-                        start_time = segment["start"]
-                        end_time = segment["end"]
-                        middle_time = start_time + (end_time - start_time) / 2
-                        
+                # Precompute the middle point of every timed segment in one vectorized pass,
+                # so the decode loop below does no per-segment dict lookups
+                segments = transcript["segments"]
+                indices = [i for i, segment in enumerate(segments) if "start" in segment and "end" in segment]
+                starts = np.fromiter((segments[i]["start"] for i in indices), dtype=np.float64, count=len(indices))
+                ends = np.fromiter((segments[i]["end"] for i in indices), dtype=np.float64, count=len(indices))
+                middles = starts + (ends - starts) / 2
+                if segment_indices is not None:
+                    indices = [segment_indices[i] for i in indices]
+                
+                # Decode forward through the video once, in timestamp order, instead of seeking
+                # per segment, which rewinds to the previous keyframe and decodes forward every time
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                order = np.argsort(middles, kind="stable")
+                if fps > 0:
+                    # Segments whose middles share a frame get the following one, so the targets are
+                    # made strictly increasing and turned into grab counts in one vectorized pass
+                    steps = np.arange(len(order))
+                    sorted_targets = np.rint(middles[order] * fps).astype(np.int64)
+                    targets = np.maximum.accumulate(np.maximum(sorted_targets - steps, 0)) + steps
+                    skips = (np.diff(targets, prepend=-1) - 1).tolist()
+                else:
+                    skips = [0] * len(order)
+                order = order.tolist()
+                starts, ends, middles = starts.tolist(), ends.tolist(), middles.tolist()
+                
+                for k, skip in zip(order, skips):
+                    i, start_time, end_time, middle_time = indices[k], starts[k], ends[k], middles[k]
+                    if log_frames:
                         self.logger.debug(f"Segment {i}: start={start_time:.2f}s, end={end_time:.2f}s, middle={middle_time:.2f}s")
-                        
-                        # Set position in video to middle of segment
+                    
+                    if fps <= 0:
+                        # Unknown frame rate, set position in video to middle of segment
                         cap.set(cv2.CAP_PROP_POS_MSEC, middle_time * 1000)
+                    
+                    # Read the frame
+                    slot = len(pending) % pool_size
+                    success, frame = read_frame(slot, skip)
+                    
+                    if success:
+                        # Save the frame
+                        frame_path = f"{frame_prefix}{i:03d}_{middle_time:.2f}s.jpg"
+                        # Encode and write on a worker thread straight from the decode buffer
+                        pending[frame_path] = buffer_writes[slot] = self._jpeg_pool.submit(write_frame, frame_path, frame)
+                        frame_paths.append(frame_path)
                         
-                        # Read the frame
-                        success, frame = cap.read()
+                        # Store the frame with segment info
+                        segment_frames.append({
+                            "segment_index": i,
+                            "time_sec": middle_time,
+                            "frame_path": frame_path
+                        })
                         
-                        if success:
-                            # Save the frame
-                            frame_path = os.path.join(frames_dir, f"frame_{i:03d}_{middle_time:.2f}s.jpg")
-                            cv2.imwrite(frame_path, frame)
-                            frame_paths.append(frame_path)
-                            
-                            # Store the frame with segment info
-                            segment_frames.append({
-                                "segment_index": i,
-                                "time_sec": middle_time,
-                                "frame_path": frame_path
-                            })
-                            
-                            self.logger.debug(f"Saved frame at middle of segment ({middle_time:.2f}s) to {frame_path}")
-                        else:
-                            self.logger.warning(f"Failed to extract frame at {middle_time:.2f}s for segment {i}")
+                        if log_frames:
+                            self.logger.debug(f"Queued frame at middle of segment ({middle_time:.2f}s) to {frame_path}")
+                    else:
+                        self.logger.warning(f"Failed to extract frame at {middle_time:.2f}s for segment {i}")
             else:
                 # No transcript segments, extract frames at regular intervals (10 seconds)
                 interval = 10  # seconds
@@ -257,12 +530,14 @@ class VideoProcessor:
                     cap.set(cv2.CAP_PROP_POS_MSEC, time_sec * 1000)
                     
                     # Read the frame
-                    success, frame = cap.read()
+                    slot = len(pending) % pool_size
+                    success, frame = read_frame(slot)
                     
                     if success:
                         # Save the frame
-                        frame_path = os.path.join(frames_dir, f"frame_{time_sec//interval:03d}_{time_sec}s.jpg")
-                        cv2.imwrite(frame_path, frame)
+                        frame_path = f"{frame_prefix}{time_sec//interval:03d}_{time_sec}s.jpg"
+                        # Encode and write on a worker thread straight from the decode buffer
+                        pending[frame_path] = buffer_writes[slot] = self._jpeg_pool.submit(write_frame, frame_path, frame)
                         frame_paths.append(frame_path)
                         
                         # Store the frame with time info
@@ -272,7 +547,30 @@ class VideoProcessor:
                             "frame_path": frame_path
                         })
                         
-                        self.logger.debug(f"Saved frame at {time_sec}s to {frame_path}")
+                        if log_frames:
+                            self.logger.debug(f"Queued frame at {time_sec}s to {frame_path}")
+        
+            # Drop frames whose write failed
+            failed = {path for path, future in pending.items() if not future.result()}
+            if failed:
+                self.logger.warning(f"Failed to write {len(failed)} frames")
+                frame_paths = [path for path in frame_paths if path not in failed]
+                segment_frames = [info for info in segment_frames if info["frame_path"] not in failed]
+            
+            # Pack the encoded frames into one archive instead of one file per frame
+            if tar_frames and frame_paths:
+                tar_path = f"{frames_dir}.tar"
+                with tarfile.open(tar_path, "w", bufsize=1 << 20) as tar:
+                    for frame_path in frame_paths:
+                        data = pending[frame_path].result()
+                        info = tarfile.TarInfo(os.path.basename(frame_path))
+                        info.size = len(data)
+                        tar.addfile(info, io.BytesIO(data))
+                
+                for info in segment_frames:
+                    info["frame_path"] = os.path.basename(info["frame_path"])
+                frame_paths = [tar_path]
+                self.logger.debug(f"Packed {len(segment_frames)} frames into {tar_path}")
             
             # Release the video capture
             cap.release()
@@ -284,9 +582,121 @@ class VideoProcessor:
             self.logger.error(f"Error extracting frames: {str(e)}")
             return {"frame_paths": [], "segment_frames": []}
 
+    def _align_frames(self, frame_data: Dict[str, Any], transcript: Dict[str, Any],
+                      paths: VideoPaths) -> Dict[str, Any]:
+        """
+        Reuse interval frames for the transcript segments whose middle they are close to,
+        and extract middle frames only for the segments that did not receive one
+        """
+        segments = transcript["segments"]
+        indices = [i for i, segment in enumerate(segments) if "start" in segment and "end" in segment]
+        starts = np.fromiter((segments[i]["start"] for i in indices), dtype=np.float64, count=len(indices))
+        ends = np.fromiter((segments[i]["end"] for i in indices), dtype=np.float64, count=len(indices))
+        middles = starts + (ends - starts) / 2
+        # An interval frame stands in for the middle frame only within this distance of the middle
+        tolerances = (ends - starts) * self.ALIGN_TOLERANCE
+        order = np.argsort(starts, kind="stable")
+        
+        # Segment position -> (distance from its middle, frame info) of the closest interval frame
+        closest = {}
+        for info in frame_data["segment_frames"]:
+            # Last segment starting at or before the frame, if the frame is before its end
+            k = int(np.searchsorted(starts[order], info["time_sec"], side="right")) - 1
+            if k < 0 or info["time_sec"] >= ends[order[k]]:
+                continue
+            k = int(order[k])
+            distance = abs(info["time_sec"] - middles[k])
+            if distance <= tolerances[k] and (k not in closest or distance < closest[k][0]):
+                closest[k] = (distance, info)
+        
+        aligned = []
+        for k, (_, info) in sorted(closest.items()):
+            info["segment_index"] = indices[k]
+            # Renamed so the frame_NNN prefix is the segment index, as for segment frames
+            frame_path = os.path.join(paths.frames_dir, f"frame_{indices[k]:03d}_{info['time_sec']}s.jpg")
+            if frame_path != info["frame_path"]:
+                os.replace(info["frame_path"], frame_path)
+                info["frame_path"] = frame_path
+            aligned.append(info)
+        
+        # The other speculative frames are outside every segment or too far from a middle to keep
+        kept = {id(info) for info in aligned}
+        for info in frame_data["segment_frames"]:
+            if id(info) not in kept:
+                try:
+                    os.remove(info["frame_path"])
+                except OSError as e:
+                    self.logger.warning(f"Could not remove unused interval frame {info['frame_path']}: {str(e)}")
+        
+        if len(aligned) < len(frame_data["segment_frames"]):
+            self.logger.debug(f"Dropped {len(frame_data['segment_frames']) - len(aligned)} interval frames not near a segment middle")
+        frame_data = {"frame_paths": [info["frame_path"] for info in aligned], "segment_frames": aligned}
+        
+        missing = [indices[k] for k in range(len(indices)) if k not in closest]
+        if not missing:
+            return frame_data
+        
+        self.logger.info(f"Extracting frames for {len(missing)} segments without a nearby interval frame")
+        extra = self.extract_frames(paths.video, {"segments": [segments[i] for i in missing]}, False, paths,
+                                    segment_indices=missing)
+        return {
+            "frame_paths": frame_data["frame_paths"] + extra["frame_paths"],
+            "segment_frames": frame_data["segment_frames"] + extra["segment_frames"]
+        }
+
+    def _cache_key(self, video_path: str, options: Tuple) -> str:
+        """Build a cache key from the video content and the processing options"""
+        hasher = hashlib.blake2b(digest_size=16)
+        # Only a prefix is hashed, so the size tells apart files that share one
+        hasher.update(str(os.path.getsize(video_path)).encode('utf-8'))
+        with open(video_path, 'rb') as f:
+            hasher.update(f.read(self.CACHE_HASH_BYTES))
+        hasher.update(repr(options).encode('utf-8'))
+        return hasher.hexdigest()
+    
+    def _load_cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a previously stored result if all of its output files still exist"""
+        cache_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(cache_path):
+            return None
+        
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {cache_path}: {str(e)}")
+            return None
+        
+        outputs = [cached.get("audio_path"), cached.get("transcript_path")] + cached.get("frame_paths", [])
+        if not all(os.path.exists(path) for path in outputs if path):
+            self.logger.debug(f"Cache entry {key} references missing files, reprocessing")
+            return None
+        
+        # Touch the entry so eviction drops the least recently used results first
+        os.utime(cache_path)
+        return cached
+    
+    def _save_cached_result(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a processing result and evict the oldest entries beyond the cache limit"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = os.path.join(self.cache_dir, f"{key}.json")
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(result, f, indent=2)
+            os.replace(tmp_path, cache_path)
+            
+            entries = sorted(Path(self.cache_dir).glob("*.json"), key=lambda p: p.stat().st_mtime)
+            for stale in entries[:-self.CACHE_MAX_ENTRIES]:
+                stale.unlink()
+                self.logger.debug(f"Evicted cache entry: {stale}")
+        except Exception as e:
+            self.logger.warning(f"Could not cache processing result: {str(e)}")
+
     def process_video(self, video_path: str, extract_audio: bool = True, 
                      transcribe: bool = True, extract_frames: bool = True,
-                     language: str = "en", debug: bool = False) -> Dict[str, Any]:
+                     language: str = "en", tar_frames: bool = False,
+                     debug: bool = False) -> Dict[str, Any]:
         """Process a video file with options for each step"""
         # Set up debug logging if requested
         if debug:
@@ -307,25 +717,40 @@ class VideoProcessor:
                 self.logger.error(f"Video file not found: {video_path}")
                 return result
             
+            # Return the stored result if this exact video was already processed with the same options
+            cache_key = self._cache_key(video_path, (extract_audio, transcribe, extract_frames, language, tar_frames, self.max_frame_edge))
+            cached = self._load_cached_result(cache_key)
+            if cached:
+                self.logger.info(f"Using cached processing result for: {video_path}")
+                cached["video_path"] = video_path
+                return cached
+            
+            paths = self.video_paths(video_path)
+            
             # 1. Extract audio if requested
             audio_path = None
             if extract_audio:
-                audio_path = self.extract_audio(video_path)
+                audio_path = self.extract_audio(video_path, paths)
                 result["audio_path"] = audio_path
             else:
                 self.logger.info("Audio extraction skipped")
             
+            # Whisper is network-bound, so while it runs frames are extracted speculatively at
+            # the fallback interval and aligned to the transcript segments once it returns
+            can_transcribe = bool(transcribe and audio_path and self.azure_client)
+            overlap = can_transcribe and extract_frames and not tar_frames
+            
             # 2. Transcribe audio if requested and available
             transcript = None
-            if transcribe and audio_path:
-                if self.azure_client:
-                    transcript = self.transcribe_audio(audio_path, language)
-                    if transcript:
-                        result["transcript_path"] = transcript.get("transcript_path")
-                    else:
-                        self.logger.warning("Transcription failed")
+            transcript_future = None
+            if can_transcribe:
+                # Written once below, after frame information has been added
+                if overlap:
+                    transcript_future = self._transcribe_pool.submit(self.transcribe_audio, audio_path, language, False, paths)
                 else:
-                    self.logger.warning("Cannot transcribe - Azure OpenAI client not configured")
+                    transcript = self.transcribe_audio(audio_path, language, save=False, paths=paths)
+            elif transcribe and audio_path:
+                self.logger.warning("Cannot transcribe - Azure OpenAI client not configured")
             elif not audio_path and transcribe:
                 self.logger.warning("Cannot transcribe - no audio extracted")
             else:
@@ -333,13 +758,25 @@ class VideoProcessor:
             
             # 3. Extract frames if requested
             frame_data = {"frame_paths": [], "segment_frames": []}
-            if extract_frames:
-                frame_data = self.extract_frames(video_path, transcript)
-                result["frame_paths"] = frame_data["frame_paths"]
+            if overlap:
+                frame_data = self.extract_frames(video_path, None, False, paths)
+                transcript = transcript_future.result()
+                if transcript and transcript.get("segments"):
+                    frame_data = self._align_frames(frame_data, transcript, paths)
+            elif extract_frames:
+                frame_data = self.extract_frames(video_path, transcript, tar_frames, paths)
             else:
                 self.logger.info("Frame extraction skipped")
+            result["frame_paths"] = frame_data["frame_paths"]
+            
+            if can_transcribe:
+                if transcript:
+                    result["transcript_path"] = transcript.get("transcript_path")
+                else:
+                    self.logger.warning("Transcription failed")
             
             # 4. Update transcript with frame information if available
+            transcript_changed = bool(transcript and not os.path.exists(transcript["transcript_path"]))
             if transcript and frame_data["segment_frames"] and "segments" in transcript:
                 self.logger.info("Integrating frame information into transcript segments")
                 
@@ -361,18 +798,24 @@ class VideoProcessor:
                             "path": frame_info["frame_path"],
                             "time": frame_info["time_sec"]
                         })
-                
-                # Save the updated transcript
-                if transcript.get("transcript_path"):
-                    try:
-                        with open(transcript["transcript_path"], 'w') as f:
-                            json.dump(transcript, f, indent=2)
-                        self.logger.info("Updated transcript with frame information")
-                    except Exception as e:
-                        self.logger.error(f"Error saving updated transcript: {str(e)}")
+                        transcript_changed = True
+            
+            # Serialize the transcript once, with any frame information included
+            if transcript_changed:
+                try:
+                    self._save_transcript(transcript)
+                    self.logger.info(f"Saved transcript with frame information to: {transcript['transcript_path']}")
+                except Exception as e:
+                    self.logger.error(f"Error saving updated transcript: {str(e)}")
+                    result["transcript_path"] = None
             
             self.logger.info(f"Video processing completed for: {video_path}")
             
+            # Only cache runs where every requested stage produced its output
+            if ((not extract_audio or result["audio_path"]) and (not transcribe or result["transcript_path"])
+                    and (not extract_frames or result["frame_paths"])):
+                self._save_cached_result(cache_key, result)
+            
             # Print the output paths for debugging
             if debug:
                 print("\nProcessing Results:")
@@ -391,10 +834,15 @@ class VideoProcessor:
             self.logger.error(f"Error processing video: {str(e)}")
             return result
 
+# Shared processor so repeated calls reuse the same Azure client and its connections
+_processor: Optional[VideoProcessor] = None
+
 def process_video(video_path: str, debug: bool = False) -> Dict[str, Any]:
     """Main function to process a video that can be called from external code"""
-    processor = VideoProcessor()
-    return processor.process_video(video_path, debug=debug)
+    global _processor
+    if _processor is None:
+        _processor = VideoProcessor()
+    return _processor.process_video(video_path, debug=debug)
 
 def main():
     """Main function demonstrating video processing"""